@@ -2,45 +2,194 @@
 """
 IoT пристрій симулятор з покращеною обробкою помилок
 Генерує випадкові дані температури та відправляє через HTTP POST
+
+Мережевий ввід/вивід асинхронний (asyncio + aiohttp): багато віртуальних
+пристроїв можуть працювати в одному event loop, а очікування відповіді
+перекривається з генерацією даних та паузами. Синхронний шлях через
+requests збережено як запасний варіант (use_async=False).
 """
 
-import json
+import asyncio
+import gzip
 import random
 import time
 import uuid
-from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+
+import aiohttp
+import orjson
 import requests
+from requests.adapters import HTTPAdapter, Retry
 from requests.exceptions import (
-    ConnectionError, 
-    Timeout, 
-    HTTPError, 
+    ConnectionError,
+    Timeout,
+    HTTPError,
     RequestException
 )
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+# Налаштування логування: гарячий шлях кладе запис у чергу (без I/O),
+# а QueueListener пише у файл і на stderr в окремому потоці
+_log_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+_log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.FileHandler('iot_device.log'),
+    logging.StreamHandler()
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+# QueueHandler.prepare формує повідомлення своїм форматтером перед
+# постановкою в чергу; без явного '%(message)s' запис відформатується
+# двічі (BASIC_FORMAT + формат слухача)
+_queue_handler = QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
 
-# Налаштування логування
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('iot_device.log'),
-        logging.StreamHandler()
-    ]
+    handlers=[_queue_handler]
 )
+_log_listener = QueueListener(_log_queue, *_log_handlers,
+                              respect_handler_level=True)
+_log_listener.start()
+
 logger = logging.getLogger(__name__)
 
+# Кеш для швидкого timestamp: datetime.now().isoformat() на кожен тик
+# дорогий, а секундний префікс рядка змінюється лише раз на секунду -
+# кешуємо його і дописуємо тільки мікросекунди
+_ts_cached_sec = 0
+_ts_cached_prefix = ""
+
+
+def fast_isoformat() -> str:
+    """
+    Поточний час у форматі ISO (як datetime.now().isoformat())
+
+    Returns:
+        Рядок виду '2024-01-15T12:30:45.123456'
+    """
+    global _ts_cached_sec, _ts_cached_prefix
+    now = time.time()
+    sec = int(now)
+    if sec != _ts_cached_sec:
+        _ts_cached_prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(sec))
+        _ts_cached_sec = sec
+    return f"{_ts_cached_prefix}.{int((now - sec) * 1_000_000):06d}"
+
+
+# Спільна aiohttp-сесія для всіх пристроїв у процесі: один connector
+# з пулом keep-alive з'єднань замість окремого пулу на кожен пристрій
+_shared_aio_session: Optional[aiohttp.ClientSession] = None
+
+
+async def get_shared_session() -> aiohttp.ClientSession:
+    """Повертає спільну aiohttp-сесію, створюючи її за потреби"""
+    global _shared_aio_session
+    if _shared_aio_session is None or _shared_aio_session.closed:
+        _shared_aio_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, keepalive_timeout=75),
+            headers={'Content-Type': 'application/json'}
+        )
+    return _shared_aio_session
+
+
+async def close_shared_session():
+    """Закриває спільну aiohttp-сесію"""
+    global _shared_aio_session
+    if _shared_aio_session is not None and not _shared_aio_session.closed:
+        await _shared_aio_session.close()
+    _shared_aio_session = None
+
+
+# Кеш результатів перевірки webhook URL: багато пристроїв з одним URL
+# перевіряють його один раз на VALIDATION_TTL, а не кожен окремо
+VALIDATION_TTL = 300  # секунди
+_validation_cache: Dict[str, tuple] = {}
+
+
+def _cached_validation(url: str) -> Optional[bool]:
+    """Повертає нещодавній результат перевірки URL або None"""
+    cached = _validation_cache.get(url)
+    if cached and time.monotonic() - cached[0] < VALIDATION_TTL:
+        return cached[1]
+    return None
+
+
+class CircuitBreaker:
+    """
+    Circuit Breaker для захисту від мертвого webhook endpoint
+
+    Стани: CLOSED (нормальна робота) → OPEN (endpoint недоступний,
+    запити блокуються без HTTP) → HALF_OPEN (один пробний запит після
+    recovery_timeout). Поки breaker відкритий, пристрій не витрачає
+    час і мережу на повторні спроби та дає endpoint'у відновитися.
+    """
+
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30):
+        """
+        Args:
+            failure_threshold: Кількість помилок поспіль до відкриття
+            recovery_timeout: Секунди до пробного запиту після відкриття
+        """
+        self.state = self.CLOSED
+        self.failure_count = 0
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.open_until = 0.0
+
+    def before_call(self) -> bool:
+        """
+        Перевіряє, чи дозволено робити запит
+
+        Returns:
+            True якщо запит дозволено, False - breaker відкритий
+        """
+        if self.state == self.OPEN:
+            if time.monotonic() < self.open_until:
+                return False
+            # Час відновлення минув - дозволяємо один пробний запит
+            self.state = self.HALF_OPEN
+            logger.info("🔎 Circuit breaker: HALF_OPEN, пробний запит")
+        return True
+
+    def on_success(self):
+        """Успішний запит - скидання лічильника, перехід у CLOSED"""
+        if self.state != self.CLOSED:
+            logger.info("🟢 Circuit breaker: CLOSED, endpoint відновлено")
+        self.state = self.CLOSED
+        self.failure_count = 0
+
+    def on_failure(self):
+        """Невдалий запит - відкриття breaker'а при досягненні порогу"""
+        self.failure_count += 1
+        if self.state == self.HALF_OPEN or self.failure_count >= self.failure_threshold:
+            self.state = self.OPEN
+            self.open_until = time.monotonic() + self.recovery_timeout
+            logger.warning(
+                f"🔴 Circuit breaker: OPEN на {self.recovery_timeout}с "
+                f"({self.failure_count} помилок поспіль)"
+            )
+
 
 class IoTDevice:
     """Клас для симуляції IoT пристрою"""
-    
-    def __init__(self, device_id: Optional[str] = None, webhook_url: str = ""):
+
+    def __init__(self, device_id: Optional[str] = None, webhook_url: str = "",
+                 use_async: bool = True):
         """
         Ініціалізація IoT пристрою
-        
+
         Args:
             device_id: Унікальний ідентифікатор пристрою
             webhook_url: URL для відправки даних
+            use_async: Використовувати aiohttp (True) чи requests (False)
         """
         self.device_id = device_id or str(uuid.uuid4())
         self.webhook_url = webhook_url or "https://httpbin.org/post"
@@ -48,166 +197,458 @@ class IoTDevice:
         self.max_temp = 30.0
         self.interval = 5  # секунди
         self.max_retries = 3
-        self.retry_delay = 2  # секунди
+        self.retry_base = 0.5  # секунди, базова затримка backoff
+        self.retry_cap = 30  # секунди, верхня межа backoff
         self.request_timeout = 10  # секунди
-        self.session = requests.Session()
-        
-        # Налаштування HTTP сесії
-        self.session.headers.update({
+        self.use_async = use_async
+
+        self.headers = {
             'Content-Type': 'application/json',
-            'User-Agent': f'IoT-Device/{self.device_id}'
-        })
-        
-        logger.info(f"IoT пристрій ініціалізовано: {self.device_id}")
-        logger.info(f"Webhook URL: {self.webhook_url}")
+            'User-Agent': f'IoT-Device/{self.device_id}',
+            'Accept-Encoding': 'gzip'
+        }
 
-    def generate_temperature_data(self) -> Dict[str, Any]:
-        """
-        Генерує дані температури
-        
-        Returns:
-            Словник з даними пристрою
-        """
-        temperature = round(random.uniform(self.min_temp, self.max_temp), 2)
-        timestamp = datetime.now().isoformat()
-        
-        data = {
+        # Тіла, більші за поріг, стискаються gzip перед відправкою;
+        # маленькі не варті витрат CPU на стискання
+        self.compress_threshold = 1024  # байти
+
+        # Пакетна відправка (асинхронний шлях): тики накопичуються і
+        # відправляються одним NDJSON POST, коли набереться batch_size
+        # записів або мине batch_timeout - менше запитів на той самий
+        # обсяг даних (batch_size=1 вимикає пакетування)
+        self.batch_size = 10
+        self.batch_timeout = 10.0  # секунди
+
+        # Спільна aiohttp сесія підключається в start() — їй потрібен
+        # запущений event loop; заголовки пристрою передаються на запит
+        self.aio_session: Optional[aiohttp.ClientSession] = None
+
+        # Запасна синхронна сесія (use_async=False): повторні спроби з
+        # backoff делеговано urllib3 Retry замість власного циклу
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        retry = Retry(
+            total=self.max_retries,
+            backoff_factor=self.retry_base,
+            backoff_max=self.retry_cap,
+            backoff_jitter=1.0,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({'GET', 'HEAD', 'POST'}),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16,
+                              max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        # Circuit breaker для цього webhook URL
+        self.breaker = CircuitBreaker()
+
+        # Власний генератор випадкових чисел: без спільного глобального
+        # стану модуля random; метод random() закешовано, бо uniform()
+        # додає зайвий виклик на кожен тик
+        self._rng = random.Random()
+        self._random = self._rng.random
+
+        # Статична частина payload будується один раз; на кожен тик
+        # заповнюються лише temperature та timestamp
+        self._payload_template = {
             "device_id": self.device_id,
-            "temperature": temperature,
+            "temperature": 0.0,
             "unit": "celsius",
-            "timestamp": timestamp,
+            "timestamp": "",
             "metadata": {
                 "sensor_type": "temperature",
                 "location": "room_1",
                 "status": "active"
             }
         }
-        
-        logger.debug(f"Згенеровано дані: {temperature}°C")
+
+        logger.info(f"IoT пристрій ініціалізовано: {self.device_id}")
+        logger.info(f"Webhook URL: {self.webhook_url}")
+
+    async def start(self):
+        """Підключає пристрій до спільної aiohttp сесії процесу"""
+        if self.aio_session is None or self.aio_session.closed:
+            self.aio_session = await get_shared_session()
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """
+        Експоненціальний backoff з повним jitter
+
+        Випадкова затримка в [0, min(cap, base * 2^(attempt-1))]
+        декорелює повторні спроби між пристроями (без retry storm).
+
+        Args:
+            attempt: Номер невдалої спроби (від 1)
+
+        Returns:
+            Затримка в секундах
+        """
+        return random.uniform(0, min(self.retry_cap, self.retry_base * (2 ** (attempt - 1))))
+
+    def _encode_body(self, data: Dict[str, Any]):
+        """
+        Серіалізує payload, стискаючи великі тіла gzip'ом
+
+        Args:
+            data: Дані для відправки
+
+        Returns:
+            Кортеж (тіло, заголовки запиту)
+        """
+        body = orjson.dumps(data)
+        if len(body) >= self.compress_threshold:
+            return (gzip.compress(body, compresslevel=5),
+                    {**self.headers, 'Content-Encoding': 'gzip'})
+        return body, self.headers
+
+    def generate_temperature_data(self) -> Dict[str, Any]:
+        """
+        Генерує дані температури
+
+        Returns:
+            Словник з даними пристрою
+        """
+        # Еквівалент random.uniform(min_temp, max_temp) без зайвого виклику
+        temperature = round(
+            self.min_temp + (self.max_temp - self.min_temp) * self._random(), 2)
+
+        # Копія шаблону зі свіжими динамічними полями (metadata статична
+        # і спільна - вона ніде не мутується)
+        data = {**self._payload_template,
+                "temperature": temperature,
+                "timestamp": fast_isoformat()}
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Згенеровано дані: %s°C", temperature)
         return data
 
-    def send_data(self, data: Dict[str, Any]) -> bool:
+    async def send_data_async(self, data: Dict[str, Any]) -> bool:
         """
-        Відправляє дані на webhook з повторними спробами
-        
+        Асинхронно відправляє дані на webhook з повторними спробами
+
         Args:
             data: Дані для відправки
-            
+
+        Returns:
+            True якщо успішно відправлено, False - інакше
+        """
+        body, headers = self._encode_body(data)
+        return await self._post_async(body, headers, f"{data['temperature']}°C")
+
+    async def send_batch_async(self, batch: List[Dict[str, Any]]) -> bool:
+        """
+        Відправляє пакет накопичених тиків одним NDJSON POST
+
+        Args:
+            batch: Список payload'ів для відправки
+
+        Returns:
+            True якщо успішно відправлено, False - інакше
+        """
+        if len(batch) == 1:
+            return await self.send_data_async(batch[0])
+
+        # NDJSON: по одному JSON-запису на рядок
+        body = b'\n'.join(orjson.dumps(record) for record in batch)
+        headers = {**self.headers, 'Content-Type': 'application/x-ndjson'}
+        if len(body) >= self.compress_threshold:
+            body = gzip.compress(body, compresslevel=5)
+            headers['Content-Encoding'] = 'gzip'
+        return await self._post_async(body, headers, f"пакет з {len(batch)} записів")
+
+    async def _post_async(self, body: bytes, headers: Dict[str, str],
+                          description: str) -> bool:
+        """
+        POST з breaker'ом, повторними спробами та backoff (асинхронний шлях)
+
+        Args:
+            body: Серіалізоване тіло запиту
+            headers: Заголовки запиту
+            description: Опис відправленого для логу
+
         Returns:
             True якщо успішно відправлено, False - інакше
         """
         for attempt in range(1, self.max_retries + 1):
+            # Швидка відмова, поки breaker відкритий - жодного HTTP
+            if not self.breaker.before_call():
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("⛔ Circuit breaker відкритий, запит пропущено")
+                return False
+
             try:
-                response = self.session.post(
+                async with self.aio_session.post(
                     self.webhook_url,
-                    json=data,
-                    timeout=self.request_timeout
-                )
-                
-                # Перевірка HTTP статусу
-                response.raise_for_status()
-                
-                logger.info(f"✅ Дані успішно відправлено: {data['temperature']}°C")
-                logger.debug(f"HTTP Status: {response.status_code}")
-                return True
-                
-            except ConnectionError as e:
+                    data=body,
+                    headers=headers,
+                    timeout=aiohttp.ClientTimeout(total=self.request_timeout)
+                ) as response:
+                    response.raise_for_status()
+
+                    self.breaker.on_success()
+                    logger.info("✅ Дані успішно відправлено: %s", description)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("HTTP Status: %s", response.status)
+                    return True
+
+            except aiohttp.ClientConnectionError as e:
                 logger.warning(f"❌ Помилка з'єднання (спроба {attempt}/{self.max_retries}): {e}")
-                
-            except Timeout as e:
+                self.breaker.on_failure()
+
+            except asyncio.TimeoutError as e:
                 logger.warning(f"⏰ Тайм-аут (спроба {attempt}/{self.max_retries}): {e}")
-                
-            except HTTPError as e:
-                logger.error(f"🚫 HTTP помилка: {e.response.status_code} - {e}")
-                if e.response.status_code < 500:
+                self.breaker.on_failure()
+
+            except aiohttp.ClientResponseError as e:
+                logger.error(f"🚫 HTTP помилка: {e.status} - {e}")
+                if e.status < 500:
                     # Клієнтська помилка (4xx) - не повторювати
                     return False
-                    
-            except RequestException as e:
+                self.breaker.on_failure()
+
+            except aiohttp.ClientError as e:
                 logger.error(f"📡 Помилка запиту (спроба {attempt}/{self.max_retries}): {e}")
-                
+                self.breaker.on_failure()
+
             except Exception as e:
                 logger.error(f"💥 Неочікувана помилка: {e}")
-                
+
             # Затримка перед наступною спробою
             if attempt < self.max_retries:
-                time.sleep(self.retry_delay)
-                
+                await asyncio.sleep(self._backoff_delay(attempt))
+
         logger.error("❌ Всі спроби відправки вичерпано")
         return False
 
-    def validate_webhook_url(self) -> bool:
+    def send_data(self, data: Dict[str, Any]) -> bool:
         """
-        Перевіряє доступність webhook URL
-        
+        Відправляє дані на webhook (синхронний шлях)
+
+        Повторні спроби з експоненціальним backoff виконує urllib3
+        Retry, налаштований на сесії в __init__.
+
+        Args:
+            data: Дані для відправки
+
         Returns:
-            True якщо URL доступний, False - інакше
+            True якщо успішно відправлено, False - інакше
         """
+        # Швидка відмова, поки breaker відкритий - жодного HTTP
+        if not self.breaker.before_call():
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("⛔ Circuit breaker відкритий, запит пропущено")
+            return False
+
         try:
-            response = self.session.get(
-                self.webhook_url.replace('/post', '/get') if 'httpbin' in self.webhook_url else self.webhook_url,
-                timeout=5
+            body, headers = self._encode_body(data)
+            response = self.session.post(
+                self.webhook_url,
+                data=body,
+                headers=headers,
+                timeout=self.request_timeout
             )
-            return response.status_code < 400
+
+            # Перевірка HTTP статусу
+            response.raise_for_status()
+
+            self.breaker.on_success()
+            logger.info("✅ Дані успішно відправлено: %s°C", data['temperature'])
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("HTTP Status: %s", response.status_code)
+            return True
+
+        except ConnectionError as e:
+            logger.warning(f"❌ Помилка з'єднання: {e}")
+            self.breaker.on_failure()
+
+        except Timeout as e:
+            logger.warning(f"⏰ Тайм-аут: {e}")
+            self.breaker.on_failure()
+
+        except HTTPError as e:
+            logger.error(f"🚫 HTTP помилка: {e.response.status_code} - {e}")
+            if e.response.status_code < 500:
+                # Клієнтська помилка (4xx) - не breaker-помилка
+                return False
+            self.breaker.on_failure()
+
+        except RequestException as e:
+            logger.error(f"📡 Помилка запиту: {e}")
+            self.breaker.on_failure()
+
+        except Exception as e:
+            logger.error(f"💥 Неочікувана помилка: {e}")
+
+        logger.error("❌ Всі спроби відправки вичерпано")
+        return False
+
+    def _validation_url(self) -> str:
+        """URL для перевірки доступності webhook"""
+        if 'httpbin' in self.webhook_url:
+            return self.webhook_url.replace('/post', '/get')
+        return self.webhook_url
+
+    async def validate_webhook_url_async(self) -> bool:
+        """
+        Асинхронно перевіряє доступність webhook URL
+
+        HEAD замість GET - без передачі тіла відповіді; результат
+        кешується, тож пристрої з одним URL перевіряють його раз на
+        VALIDATION_TTL.
+
+        Returns:
+            True якщо URL доступний, False - інакше
+        """
+        cached = _cached_validation(self.webhook_url)
+        if cached is not None:
+            return cached
+
+        try:
+            async with self.aio_session.head(
+                self._validation_url(),
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=5)
+            ) as response:
+                # 405 означає, що endpoint живий, але HEAD не підтримує
+                result = response.status < 400 or response.status == 405
         except Exception as e:
             logger.warning(f"⚠️ Не вдалося перевірити webhook URL: {e}")
             return False
 
-    def run(self):
+        _validation_cache[self.webhook_url] = (time.monotonic(), result)
+        return result
+
+    def validate_webhook_url(self) -> bool:
         """
-        Основний цикл роботи пристрою
+        Перевіряє доступність webhook URL (синхронний шлях)
+
+        Returns:
+            True якщо URL доступний, False - інакше
         """
+        cached = _cached_validation(self.webhook_url)
+        if cached is not None:
+            return cached
+
+        try:
+            response = self.session.head(self._validation_url(), timeout=5)
+            # 405 означає, що endpoint живий, але HEAD не підтримує
+            result = response.status_code < 400 or response.status_code == 405
+        except Exception as e:
+            logger.warning(f"⚠️ Не вдалося перевірити webhook URL: {e}")
+            return False
+
+        _validation_cache[self.webhook_url] = (time.monotonic(), result)
+        return result
+
+    def _print_banner(self):
+        """Виводить стартову інформацію про пристрій"""
         print(f"🚀 IoT пристрій {self.device_id} запущено")
         print(f"📡 Відправка даних на: {self.webhook_url}")
         print(f"⏱️ Інтервал: {self.interval} секунд")
         print(f"🌡️ Діапазон температури: {self.min_temp}°C - {self.max_temp}°C")
         print("-" * 60)
-        
+
+    async def run_async(self):
+        """
+        Основний асинхронний цикл роботи пристрою
+        """
+        self._print_banner()
+
+        await self.start()
+
+        # Перевірка webhook URL
+        if not await self.validate_webhook_url_async():
+            logger.warning("⚠️ Webhook URL може бути недоступний")
+
+        batch: List[Dict[str, Any]] = []
+        batch_deadline = 0.0
+
+        try:
+            while True:
+                try:
+                    # Генерація даних; тики накопичуються в пакет
+                    batch.append(self.generate_temperature_data())
+                    if len(batch) == 1:
+                        batch_deadline = time.monotonic() + self.batch_timeout
+
+                    # Відправка, коли пакет повний або минув таймер
+                    if (len(batch) >= self.batch_size
+                            or time.monotonic() >= batch_deadline):
+                        await self.send_batch_async(batch)
+                        batch = []
+
+                    # Поки breaker відкритий, відправка повертається
+                    # миттєво - достатньо звичайної паузи між ітераціями
+
+                    # Затримка перед наступною ітерацією
+                    await asyncio.sleep(self.interval)
+
+                except asyncio.CancelledError:
+                    logger.info("🛑 Отримано сигнал зупинки")
+                    break
+
+                except Exception as e:
+                    logger.error(f"💥 Критична помилка в основному циклі: {e}")
+                    logger.info("🔄 Перезапуск через 10 секунд...")
+                    await asyncio.sleep(10)
+
+            # Відправка недовідправленого пакета перед зупинкою
+            if batch:
+                await self.send_batch_async(batch)
+
+        except Exception as e:
+            logger.critical(f"💀 Фатальна помилка: {e}")
+
+        finally:
+            await self.cleanup_async()
+
+    def run(self):
+        """
+        Основний цикл роботи пристрою (синхронний запасний шлях)
+        """
+        self._print_banner()
+
         # Перевірка webhook URL
         if not self.validate_webhook_url():
             logger.warning("⚠️ Webhook URL може бути недоступний")
-        
-        consecutive_failures = 0
-        max_consecutive_failures = 5
-        
+
         try:
             while True:
                 try:
                     # Генерація та відправка даних
                     data = self.generate_temperature_data()
-                    success = self.send_data(data)
-                    
-                    if success:
-                        consecutive_failures = 0
-                    else:
-                        consecutive_failures += 1
-                        
-                    # Перевірка на критичну кількість помилок
-                    if consecutive_failures >= max_consecutive_failures:
-                        logger.critical(f"🔴 Критична помилка: {consecutive_failures} невдалих спроб поспіль")
-                        logger.info("🔄 Перезапуск через 30 секунд...")
-                        time.sleep(30)
-                        consecutive_failures = 0
-                        continue
-                        
+                    self.send_data(data)
+
+                    # Поки breaker відкритий, send_data повертається
+                    # миттєво - достатньо звичайної паузи між ітераціями
+
                     # Затримка перед наступною ітерацією
                     time.sleep(self.interval)
-                    
+
                 except KeyboardInterrupt:
                     logger.info("🛑 Отримано сигнал зупинки від користувача")
                     break
-                    
+
                 except Exception as e:
                     logger.error(f"💥 Критична помилка в основному циклі: {e}")
                     logger.info("🔄 Перезапуск через 10 секунд...")
                     time.sleep(10)
-                    
+
         except Exception as e:
             logger.critical(f"💀 Фатальна помилка: {e}")
-            
+
         finally:
             self.cleanup()
 
+    async def cleanup_async(self):
+        """Очищення ресурсів (асинхронний шлях)"""
+        logger.info("🧹 Очищення ресурсів...")
+        # Сесія спільна для всіх пристроїв - її закриває run_devices
+        self.aio_session = None
+        logger.info("👋 IoT пристрій зупинено")
+
     def cleanup(self):
         """Очищення ресурсів"""
         logger.info("🧹 Очищення ресурсів...")
@@ -216,6 +657,19 @@ class IoTDevice:
         logger.info("👋 IoT пристрій зупинено")
 
 
+async def run_devices(devices: List[IoTDevice]):
+    """
+    Запускає кілька віртуальних пристроїв в одному event loop
+
+    Args:
+        devices: Список пристроїв для запуску
+    """
+    try:
+        await asyncio.gather(*[device.run_async() for device in devices])
+    finally:
+        await close_shared_session()
+
+
 def main():
     """Головна функція"""
     # Конфігурація (можна винести в окремий файл config.json)
@@ -224,23 +678,30 @@ def main():
         "device_id": None,  # Автоматично згенерується UUID
         "min_temp": 18.0,
         "max_temp": 32.0,
-        "interval": 5
+        "interval": 5,
+        "device_count": 1  # Кількість віртуальних пристроїв
     }
-    
-    # Створення та запуск пристрою
-    device = IoTDevice(
-        device_id=config["device_id"],
-        webhook_url=config["webhook_url"]
-    )
-    
-    # Налаштування параметрів
-    device.min_temp = config["min_temp"]
-    device.max_temp = config["max_temp"]
-    device.interval = config["interval"]
-    
+
+    # Створення пристроїв
+    devices = []
+    for _ in range(config["device_count"]):
+        device = IoTDevice(
+            device_id=config["device_id"],
+            webhook_url=config["webhook_url"]
+        )
+
+        # Налаштування параметрів
+        device.min_temp = config["min_temp"]
+        device.max_temp = config["max_temp"]
+        device.interval = config["interval"]
+        devices.append(device)
+
     # Запуск
-    device.run()
+    try:
+        asyncio.run(run_devices(devices))
+    except KeyboardInterrupt:
+        logger.info("🛑 Отримано сигнал зупинки від користувача")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -3,10 +3,14 @@
 Тестовий Flask сервер для прийому даних від IoT пристроїв
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, Response
+from collections import deque
 from datetime import datetime
-import json
+import gzip
 import logging
+import threading
+import time
+import orjson
 
 # Налаштування логування
 logging.basicConfig(
@@ -15,200 +19,417 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Werkzeug пише рядок логу на кожен запит - при потоці webhook-запитів
+# це помітні витрати на I/O; залишаємо лише попередження
+logging.getLogger('werkzeug').setLevel(logging.WARNING)
+
 app = Flask(__name__)
 
-# Зберігання отриманих даних в пам'яті
-received_data = []
+# Зберігання отриманих даних в пам'яті: deque з фіксованою місткістю -
+# O(1) додавання, старі записи витісняються автоматично, пам'ять обмежена
+MAX_RECORDS = 10000
+received_data = deque(maxlen=MAX_RECORDS)
+
+# Індекс за device_id: /data?device_id=... читає O(k) записів пристрою
+# замість повного обходу received_data
+data_by_device = {}
+
+# Лок сховища: store_record підтримує інваріант "голова received_data =
+# голова своєї deque в індексі", тож фоновий flusher, читачі та /clear
+# не повинні чергувати доступ до обох контейнерів
+_storage_lock = threading.Lock()
+
+
+def store_record(data):
+    """Додає запис у сховище та індекс, підтримуючи їх узгодженість"""
+    if len(received_data) == MAX_RECORDS:
+        # deque витіснить найстаріший запис - прибираємо його з індексу
+        evicted = received_data[0]
+        device_records = data_by_device.get(evicted.get('device_id'))
+        if device_records:
+            device_records.popleft()
+            if not device_records:
+                del data_by_device[evicted.get('device_id')]
+
+    received_data.append(data)
+    data_by_device.setdefault(data.get('device_id'), deque()).append(data)
+
+
+# Буфер пакетного прийому: webhook лише додає запис у список під локом,
+# а фоновий потік переносить накопичене у сховище раз на FLUSH_INTERVAL.
+# Так вартість store_record амортизується по всьому пакету замість
+# оплати на кожен запит.
+FLUSH_INTERVAL = 0.1  # секунди
+_pending = []
+_pending_lock = threading.Lock()
+
+
+def flush_pending():
+    """Переносить накопичені записи з буфера у сховище та індекс"""
+    global _pending
+    with _pending_lock:
+        if not _pending:
+            return
+        batch, _pending = _pending, []
+    with _storage_lock:
+        for record in batch:
+            store_record(record)
+
+
+def _flusher_loop():
+    """Фоновий потік, який періодично скидає буфер"""
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        flush_pending()
+
+
+threading.Thread(target=_flusher_loop, daemon=True,
+                 name='ingest-flusher').start()
+
+
+def json_response(payload, status: int = 200) -> Response:
+    """Серіалізує відповідь через orjson (швидше за jsonify/stdlib json)"""
+    return Response(orjson.dumps(payload), status=status,
+                    mimetype='application/json')
+
+
+def static_response(body: bytes, status: int) -> Response:
+    """Відповідь із заздалегідь серіалізованим тілом (без dumps на запит)"""
+    return Response(body, status=status, mimetype='application/json')
+
+
+# Статичні тіла помилок серіалізуються один раз при старті, а не на
+# кожен поганий запит
+_ERR_EMPTY_DATA = orjson.dumps({
+    "status": "error", "message": "Порожні дані"})
+_ERR_BAD_TEMPERATURE = orjson.dumps({
+    "status": "error", "message": "temperature повинна бути числом"})
+_ERR_BAD_DEVICE_ID = orjson.dumps({
+    "status": "error", "message": "device_id повинен бути непорожнім рядком"})
+_ERR_BAD_JSON = orjson.dumps({
+    "status": "error", "message": "Невірний JSON формат"})
+_ERR_BAD_GZIP = orjson.dumps({
+    "status": "error", "message": "Невірне gzip-стиснення тіла"})
+_ERR_INTERNAL = orjson.dumps({
+    "status": "error", "message": "Внутрішня помилка сервера"})
+_ERR_GET_DATA = orjson.dumps({
+    "status": "error", "message": "Помилка при отриманні даних"})
+_ERR_STATS = orjson.dumps({
+    "status": "error", "message": "Помилка при обчисленні статистики"})
+_ERR_CLEAR = orjson.dumps({
+    "status": "error", "message": "Помилка при очищенні даних"})
+_ERR_NOT_FOUND = orjson.dumps({
+    "status": "error", "message": "Endpoint не знайдено"})
+_ERR_METHOD_NOT_ALLOWED = orjson.dumps({
+    "status": "error", "message": "HTTP метод не дозволено"})
+
+# Відповіді, більші за поріг, стискаються gzip'ом для клієнтів з
+# Accept-Encoding: gzip; маленькі не варті витрат CPU на стискання
+COMPRESS_MIN_SIZE = 512  # байти
+
+
+@app.after_request
+def compress_response(response):
+    """Стискає великі відповіді gzip'ом, якщо клієнт його приймає"""
+    if (response.status_code == 200
+            and not response.direct_passthrough
+            and response.content_length is not None
+            and response.content_length > COMPRESS_MIN_SIZE
+            and 'Content-Encoding' not in response.headers
+            and 'gzip' in request.headers.get('Accept-Encoding', '')):
+        response.set_data(gzip.compress(response.get_data(), compresslevel=5))
+        response.headers['Content-Encoding'] = 'gzip'
+        response.headers.add('Vary', 'Accept-Encoding')
+    return response
+
+def _validate_record(data):
+    """
+    Перевіряє один запис від пристрою
+
+    isinstance-перевірки замість try/except - на гарячому шляху виняток
+    на кожен поганий запит коштує дорого.
+
+    Returns:
+        Response з помилкою 400 або None, якщо запис коректний
+    """
+    required_fields = ['device_id', 'temperature', 'timestamp']
+    missing_fields = [field for field in required_fields if field not in data]
+
+    if missing_fields:
+        logger.warning(f"Відсутні поля: {missing_fields}")
+        return json_response({
+            "status": "error",
+            "message": f"Відсутні обов'язкові поля: {missing_fields}"
+        }, 400)
+
+    temperature = data['temperature']
+    if isinstance(temperature, bool) or not isinstance(temperature, (int, float)):
+        # Рідкісний випадок: числовий рядок ("25") - приймався і раніше,
+        # тому тут try/except лишається, але вже поза гарячим шляхом
+        if isinstance(temperature, str):
+            try:
+                data['temperature'] = float(temperature)
+            except ValueError:
+                logger.warning(f"Невірний формат даних: temperature={temperature!r}")
+                return static_response(_ERR_BAD_TEMPERATURE, 400)
+        else:
+            logger.warning(f"Невірний формат даних: temperature={temperature!r}")
+            return static_response(_ERR_BAD_TEMPERATURE, 400)
+
+    if not isinstance(data['device_id'], str) or not data['device_id'].strip():
+        logger.warning(f"Невірний формат даних: device_id={data['device_id']!r}")
+        return static_response(_ERR_BAD_DEVICE_ID, 400)
+
+    return None
+
 
 @app.route('/webhook', methods=['POST'])
 def webhook():
     """Обробник webhook для отримання даних від IoT пристроїв"""
     try:
-        # Отримання JSON даних
-        data = request.get_json()
-        
-        if not data:
+        # Отримання JSON даних (orjson парсить тіло напряму, без Flask-обгортки)
+        body = request.get_data()
+
+        # Пристрої стискають великі payload'и gzip'ом
+        if body and request.headers.get('Content-Encoding') == 'gzip':
+            try:
+                body = gzip.decompress(body)
+            except (OSError, EOFError):
+                logger.warning("Невірне gzip-тіло запиту")
+                return static_response(_ERR_BAD_GZIP, 400)
+
+        # NDJSON-пакет від пристроїв: по одному JSON-запису на рядок
+        if request.content_type and request.content_type.startswith(
+                'application/x-ndjson'):
+            records = [orjson.loads(line) for line in body.splitlines() if line]
+        else:
+            records = [orjson.loads(body)] if body else []
+
+        if not records or not all(records):
             logger.warning("Отримано порожні дані")
-            return jsonify({
-                "status": "error", 
-                "message": "Порожні дані"
-            }), 400
-        
-        # Валідація обов'язкових полів
-        required_fields = ['device_id', 'temperature', 'timestamp']
-        missing_fields = [field for field in required_fields if field not in data]
-        
-        if missing_fields:
-            logger.warning(f"Відсутні поля: {missing_fields}")
-            return jsonify({
-                "status": "error",
-                "message": f"Відсутні обов'язкові поля: {missing_fields}"
-            }), 400
-        
-        # Валідація типів даних
-        try:
-            temperature = float(data['temperature'])
-            if not isinstance(data['device_id'], str) or not data['device_id'].strip():
-                raise ValueError("device_id повинен бути непорожнім рядком")
-        except (ValueError, TypeError) as e:
-            logger.warning(f"Невірний формат даних: {e}")
-            return jsonify({
-                "status": "error",
-                "message": f"Невірний формат даних: {e}"
-            }), 400
-        
-        # Додавання часу отримання
-        data['received_at'] = datetime.now().isoformat()
-        
-        # Збереження даних
-        received_data.append(data)
-        
-        # Логування
-        logger.info(f"📨 Отримано дані від {data['device_id']}: {temperature}°C")
-        
+            return static_response(_ERR_EMPTY_DATA, 400)
+
+        received_at = datetime.now().isoformat()
+        for data in records:
+            error = _validate_record(data)
+            if error is not None:
+                return error
+            # Додавання часу отримання
+            data['received_at'] = received_at
+
+        # Збереження даних: лише додавання в буфер, фоновий потік
+        # перенесе записи у сховище
+        with _pending_lock:
+            _pending.extend(records)
+            pending_count = len(_pending)
+
+        # Логування: debug, щоб не писати рядок на кожен запит
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"📨 Отримано {len(records)} записів")
+
         # Відповідь клієнту
         response = {
             "status": "success",
             "message": "Дані успішно отримано",
-            "received_at": data['received_at'],
-            "data_count": len(received_data)
+            "received_at": received_at,
+            "data_count": len(received_data) + pending_count
         }
         
-        return jsonify(response), 200
+        return json_response(response, 200)
         
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         logger.error("Помилка декодування JSON")
-        return jsonify({
-            "status": "error",
-            "message": "Невірний JSON формат"
-        }), 400
+        return static_response(_ERR_BAD_JSON, 400)
         
     except Exception as e:
         logger.error(f"Неочікувана помилка: {e}")
-        return jsonify({
-            "status": "error",
-            "message": "Внутрішня помилка сервера"
-        }), 500
+        return static_response(_ERR_INTERNAL, 500)
 
 @app.route('/data', methods=['GET'])
 def get_data():
     """Отримання всіх збережених даних"""
     try:
+        flush_pending()  # читачі бачать і щойно прийняті записи
         device_id = request.args.get('device_id')
         limit = request.args.get('limit', type=int)
         
-        # Фільтрація за device_id
-        filtered_data = received_data
-        if device_id:
-            filtered_data = [d for d in received_data if d.get('device_id') == device_id]
-        
+        # Фільтрація за device_id через індекс - O(k), без обходу всього сховища
+        with _storage_lock:
+            if device_id:
+                filtered_data = list(data_by_device.get(device_id, ()))
+            else:
+                filtered_data = list(received_data)
+
         # Обмеження кількості записів
         if limit and limit > 0:
             filtered_data = filtered_data[-limit:]
         
-        return jsonify({
+        return json_response({
             "status": "success",
             "total_count": len(received_data),
             "filtered_count": len(filtered_data),
             "data": filtered_data
-        }), 200
+        }, 200)
         
     except Exception as e:
         logger.error(f"Помилка при отриманні даних: {e}")
-        return jsonify({
-            "status": "error",
-            "message": "Помилка при отриманні даних"
-        }), 500
+        return static_response(_ERR_GET_DATA, 500)
 
 @app.route('/stats', methods=['GET'])
 def get_stats():
     """Статистика отриманих даних"""
     try:
+        flush_pending()  # читачі бачать і щойно прийняті записи
         if not received_data:
-            return jsonify({
+            return json_response({
                 "status": "success",
                 "message": "Немає даних",
                 "stats": {}
-            }), 200
-        
-        # Підрахунок статистики
-        devices = set(d.get('device_id') for d in received_data)
-        temperatures = [float(d.get('temperature', 0)) for d in received_data if 'temperature' in d]
-        
+            }, 200)
+
+        # Підрахунок статистики за один прохід (алгоритм Welford для
+        # середнього/дисперсії замість трьох окремих обходів списку)
+        devices = set()
+        count = 0
+        mean = 0.0
+        m2 = 0.0
+        t_min = float('inf')
+        t_max = float('-inf')
+
+        with _storage_lock:
+            for d in received_data:
+                devices.add(d.get('device_id'))
+                if 'temperature' not in d:
+                    continue
+                value = float(d['temperature'])
+                count += 1
+                delta = value - mean
+                mean += delta / count
+                m2 += delta * (value - mean)
+                if value < t_min:
+                    t_min = value
+                if value > t_max:
+                    t_max = value
+
         stats = {
             "total_records": len(received_data),
             "unique_devices": len(devices),
             "devices": list(devices),
             "temperature_stats": {
-                "min": min(temperatures) if temperatures else 0,
-                "max": max(temperatures) if temperatures else 0,
-                "avg": sum(temperatures) / len(temperatures) if temperatures else 0,
-                "count": len(temperatures)
+                "min": t_min if count else 0,
+                "max": t_max if count else 0,
+                "avg": mean if count else 0,
+                "stddev": (m2 / count) ** 0.5 if count else 0,
+                "count": count
             }
         }
         
-        return jsonify({
+        return json_response({
             "status": "success",
             "stats": stats
-        }), 200
+        }, 200)
         
     except Exception as e:
         logger.error(f"Помилка при обчисленні статистики: {e}")
-        return jsonify({
-            "status": "error",
-            "message": "Помилка при обчисленні статистики"
-        }), 500
+        return static_response(_ERR_STATS, 500)
 
 @app.route('/clear', methods=['POST'])
 def clear_data():
     """Очищення всіх збережених даних"""
     global received_data
     try:
-        count = len(received_data)
-        received_data.clear()
+        flush_pending()
+        with _storage_lock:
+            count = len(received_data)
+            received_data.clear()
+            data_by_device.clear()
         logger.info(f"🧹 Очищено {count} записів")
         
-        return jsonify({
+        return json_response({
             "status": "success",
             "message": f"Очищено {count} записів"
-        }), 200
+        }, 200)
         
     except Exception as e:
         logger.error(f"Помилка при очищенні даних: {e}")
-        return jsonify({
-            "status": "error",
-            "message": "Помилка при очищенні даних"
-        }), 500
-
-@app.route('/health', methods=['GET'])
-def health_check():
-    """Перевірка стану сервера"""
-    return jsonify({
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "records_count": len(received_data)
-    }), 200
+        return static_response(_ERR_CLEAR, 500)
+
+def _health_fast_path(wsgi_app):
+    """
+    WSGI-обгортка, що відповідає на GET /health до входу в Flask
+
+    Health-check опитується часто; ця відповідь не потребує
+    маршрутизації, контексту запиту чи логування - лише довжини
+    сховища і поточного часу.
+    """
+    def middleware(environ, start_response):
+        if (environ.get('PATH_INFO') == '/health'
+                and environ.get('REQUEST_METHOD') == 'GET'):
+            body = orjson.dumps({
+                "status": "healthy",
+                "timestamp": datetime.now().isoformat(),
+                "records_count": len(received_data) + len(_pending)
+            })
+            start_response('200 OK', [
+                ('Content-Type', 'application/json'),
+                ('Content-Length', str(len(body)))
+            ])
+            return [body]
+        return wsgi_app(environ, start_response)
+    return middleware
+
+
+app.wsgi_app = _health_fast_path(app.wsgi_app)
 
 @app.errorhandler(404)
 def not_found(error):
-    return jsonify({
-        "status": "error",
-        "message": "Endpoint не знайдено"
-    }), 404
+    return static_response(_ERR_NOT_FOUND, 404)
 
 @app.errorhandler(405)
 def method_not_allowed(error):
-    return jsonify({
-        "status": "error",
-        "message": "HTTP метод не дозволено"
-    }), 405
+    return static_response(_ERR_METHOD_NOT_ALLOWED, 405)
 
 @app.errorhandler(500)
 def internal_error(error):
-    return jsonify({
-        "status": "error",
-        "message": "Внутрішня помилка сервера"
-    }), 500
+    return static_response(_ERR_INTERNAL, 500)
+
+def run_server(host: str = '0.0.0.0', port: int = 5000, workers: int = 4):
+    """
+    Запускає сервер через gunicorn (production WSGI), якщо він доступний
+
+    Flask dev-сервер однопоточний на процес і не призначений для
+    навантаження; gunicorn з gevent-воркерами обробляє багато
+    одночасних запитів. Без gunicorn (напр. Windows) - запасний
+    варіант app.run.
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        logger.warning("⚠️ gunicorn не встановлено, запуск dev-сервера Flask")
+        app.run(host=host, port=port, debug=False, threaded=True)
+        return
+
+    # gevent-воркери, якщо gevent встановлено, інакше синхронні
+    try:
+        import gevent  # noqa: F401
+        worker_class = 'gevent'
+    except ImportError:
+        worker_class = 'sync'
+
+    class StandaloneServer(BaseApplication):
+        """Запуск gunicorn без окремого конфіг-файлу"""
+
+        def load_config(self):
+            self.cfg.set('bind', f'{host}:{port}')
+            self.cfg.set('workers', workers)
+            self.cfg.set('worker_class', worker_class)
+
+        def load(self):
+            return app
+
+    logger.info(f"Запуск gunicorn: {workers} воркерів ({worker_class})")
+    StandaloneServer().run()
+
 
 if __name__ == '__main__':
     print("🚀 Запуск тестового сервера...")
@@ -219,11 +440,6 @@ if __name__ == '__main__':
     print("  POST /clear   - Очищення даних")
     print("  GET  /health  - Перевірка стану")
     print("-" * 50)
-    
+
     # Запуск сервера
-    app.run(
-        host='0.0.0.0',  # Доступ з будь-якої IP
-        port=5000,
-        debug=True,      # Режим розробки
-        threaded=True    # Підтримка багатьох одночасних запитів
-    )
\ No newline at end of file
+    run_server()
\ No newline at end of file